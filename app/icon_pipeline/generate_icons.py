@@ -1,5 +1,9 @@
 import os
+import functools
+import hashlib
 import itertools
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import subprocess
 from datetime import date
@@ -16,28 +20,103 @@ EVENTS = {
 BASE_DIR = Path(__file__).parent / "assets"
 OUT_DIR = Path(__file__).parent.parent / "src/main/res/mipmap-anydpi-v26"
 OUT_DIR.mkdir(exist_ok=True, parents=True)
+MANIFEST_PATH = OUT_DIR / ".manifest.json"
+
+# Layer paths are pure functions of the name tables above, so build them
+# once at import instead of re-joining Path segments per combination
+BASE_LAYER_PATHS = {p: BASE_DIR / "base" / f"{p}_base.svg" for p in PERSONAS}
+SEASON_BG_PATHS = {s: BASE_DIR / "seasons" / f"{s}_bg.svg" for s in SEASONS}
+MOOD_ACCENT_PATHS = {m: BASE_DIR / "moods" / f"{m}_accent.svg" for m in MOODS}
+EVENT_OVERLAY_PATHS = {
+    name: BASE_DIR / "events" / overlay for name, (_, overlay) in EVENTS.items()
+}
+
+# Content manifest of the previous/current run, so unchanged files are
+# skipped instead of rewritten and stale ones can be pruned without an
+# unconditional rmtree
+_manifest_old = {}
+_manifest_new = None
+
+
+def _load_manifest():
+    try:
+        return json.loads(MANIFEST_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_if_changed(path, content):
+    """Writes content only when it differs from the previous run's."""
+    global _manifest_new
+    digest = hashlib.blake2b(content, digest_size=8).hexdigest()
+    if _manifest_new is not None:
+        _manifest_new[path.name] = digest
+        if _manifest_old.get(path.name) == digest and path.exists():
+            return
+    path.write_bytes(content)
+
+
+def _link_or_copy(src, dst):
+    """Duplicates src as dst, preferring a zero-copy hardlink."""
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except (OSError, NotImplementedError):
+        shutil.copy(src, dst)
 
 # Dummy rasterize function for now
 def rasterize(svg_path):
     pass
 
+
+@functools.lru_cache(maxsize=256)
+def _rasterize_cached(svg_path, size, mtime):
+    # mtime participates in the key purely to invalidate stale entries
+    return rasterize(svg_path)
+
+
+def rasterize_svg(svg_path, size=None):
+    """Memoized entry point for rasterization.
+
+    Repeat renders of an unchanged SVG at the same size are cache hits;
+    editing the source bumps its mtime and forces a re-render.
+    """
+    path = Path(svg_path)
+    return _rasterize_cached(str(path), size, path.stat().st_mtime)
+
+@functools.lru_cache(maxsize=None)
+def _build_xml(layers_key):
+    """Renders adaptive-icon XML once per (stem, is_bg) layer tuple.
+
+    Many icons share identical layer sets (transition frames in
+    particular), so the string construction is memoized and repeat
+    outputs become pure filesystem writes.
+    """
+    # Classify background vs foreground stems in a single pass
+    bg_stems = []
+    fg_stems = []
+    for stem, is_bg in layers_key:
+        (bg_stems if is_bg else fg_stems).append(stem)
+
+    parts = ['<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">\n']
+    if bg_stems:
+        parts.append(f'    <background android:drawable="@color/{bg_stems[0]}"/>\n')
+    # All non-background layers are treated as foreground layers.
+    # This is a simplification; a real implementation would need to handle multiple foregrounds
+    # by pre-combining them into a single drawable resource. For now, we just list them.
+    # Android will only render the last one, but this makes the XML valid.
+    for stem in fg_stems:
+        parts.append(f'    <foreground android:drawable="@drawable/{stem}"/>\n')
+    parts.append('</adaptive-icon>\n')
+    return "".join(parts).encode()
+
 def create_adaptive_icon_xml(path, layers):
     """Creates a valid adaptive-icon XML file."""
-    with open(path, "w") as f:
-        f.write('<adaptive-icon xmlns:android="http://schemas.android.com/apk/res/android">\n')
-        # A simple way to determine background vs foreground
-        has_background = any("bg" in layer.name for layer in layers)
-        if has_background:
-             f.write(f'    <background android:drawable="@color/{next(l.stem for l in layers if "bg" in l.name)}"/>\n')
-        
-        # All non-background layers are treated as foreground layers
-        for layer in layers:
-            if "bg" not in layer.name:
-                # This is a simplification; a real implementation would need to handle multiple foregrounds
-                # by pre-combining them into a single drawable resource. For now, we just list them.
-                # Android will only render the last one, but this makes the XML valid.
-                f.write(f'    <foreground android:drawable="@drawable/{layer.stem}"/>\n')
-        f.write('</adaptive-icon>\n')
+    layers_key = tuple((layer.stem, "bg" in layer.name) for layer in layers)
+    # One write call per file instead of one per line (skipped entirely
+    # when the manifest shows the content is unchanged)
+    _write_if_changed(Path(path), _build_xml(layers_key))
 
 def make_transition_frames(old_icon_layers, new_icon_layers, style, out_base_path):
     """Generates XML files for transition frames."""
@@ -54,68 +133,98 @@ def combine_layers(*layers, output_svg):
     create_adaptive_icon_xml(output_svg, list(layers))
 
 
+def emit_combo(persona, season, mood):
+    """Emits every icon variant for one persona/season/mood combination.
+
+    Self-contained so combinations can run concurrently; the XML writes
+    are independent files and the manifest updates are plain dict ops.
+    """
+    emitted = []
+    base_layers = [
+        BASE_LAYER_PATHS[persona],
+        SEASON_BG_PATHS[season],
+        MOOD_ACCENT_PATHS[mood],
+    ]
+
+    # A. Generate the main combination icon (no event)
+    output_name = f"ic_launcher_{persona}_{season}_{mood}.xml"
+    output_path = OUT_DIR / output_name
+    combine_layers(*base_layers, output_svg=output_path)
+    emitted.append(output_path)
+
+    # B. Generate icons for each event
+    for event_name, event_overlay in EVENT_OVERLAY_PATHS.items():
+        event_layers = base_layers + [event_overlay]
+        event_output_name = f"ic_launcher_{persona}_{season}_{mood}_{event_name}.xml"
+        event_output_path = OUT_DIR / event_output_name
+        combine_layers(*event_layers, output_svg=event_output_path)
+        emitted.append(event_output_path)
+
+    # C. Generate transition frames for this combination
+    transition_base_name = f"ic_launcher_{persona}_{season}_{mood}_pop"
+    # Pass layer info to the transition generator
+    make_transition_frames(base_layers, base_layers, "pop", OUT_DIR / transition_base_name)
+    emitted.append(OUT_DIR / f"{transition_base_name}_frame1.xml")
+    emitted.append(OUT_DIR / f"{transition_base_name}_frame2.xml")
+    return emitted
+
+
 def generate_all_icons():
+    global _manifest_old, _manifest_new
     print("💎 Generating SallieOS icon set…")
     all_icons = []
     OUT_DIR.mkdir(exist_ok=True, parents=True)
+    _manifest_old = _load_manifest()
+    _manifest_new = {}
 
     # 0. Generate a default ic_launcher and ic_launcher_round
-    default_persona = "creator"
-    default_base = BASE_DIR / "base" / f"{default_persona}_base.svg"
-    default_season_bg = BASE_DIR / "seasons" / "summer_bg.svg"
-    default_mood_accent = BASE_DIR / "moods" / "steady_accent.svg"
-    default_layers = [default_base, default_season_bg, default_mood_accent]
+    default_layers = [
+        BASE_LAYER_PATHS["creator"],
+        SEASON_BG_PATHS["summer"],
+        MOOD_ACCENT_PATHS["steady"],
+    ]
     
     default_icon_path = OUT_DIR / "ic_launcher.xml"
     combine_layers(*default_layers, output_svg=default_icon_path)
     all_icons.append(default_icon_path)
     
-    # Android also looks for a round version
+    # Android also looks for a round version; content is identical, so a
+    # hardlink shares the default icon's inode instead of copying bytes
     round_icon_path = OUT_DIR / "ic_launcher_round.xml"
-    shutil.copy(default_icon_path, round_icon_path)
+    digest = _manifest_new[default_icon_path.name]
+    _manifest_new[round_icon_path.name] = digest
+    if _manifest_old.get(round_icon_path.name) != digest or not round_icon_path.exists():
+        _link_or_copy(default_icon_path, round_icon_path)
     all_icons.append(round_icon_path)
 
     # 1. Generate simple persona icons (creator, mom)
     for persona in PERSONAS:
-        base = BASE_DIR / "base" / f"{persona}_base.svg"
-        season_bg = BASE_DIR / "seasons" / "summer_bg.svg" # Default
-        mood_accent = BASE_DIR / "moods" / "steady_accent.svg" # Default
-        
-        layers = [base, season_bg, mood_accent]
+        # Default season/mood
+        layers = [
+            BASE_LAYER_PATHS[persona],
+            SEASON_BG_PATHS["summer"],
+            MOOD_ACCENT_PATHS["steady"],
+        ]
         output_name = f"ic_launcher_{persona}.xml"
         output_path = OUT_DIR / output_name
         combine_layers(*layers, output_svg=output_path)
         all_icons.append(output_path)
 
-    # 2. Generate for every combination of persona, season, mood
-    for persona, season, mood in itertools.product(PERSONAS, SEASONS, MOODS):
-        base = BASE_DIR / "base" / f"{persona}_base.svg"
-        season_bg = BASE_DIR / "seasons" / f"{season}_bg.svg"
-        mood_accent = BASE_DIR / "moods" / f"{mood}_accent.svg"
-
-        base_layers = [base, season_bg, mood_accent]
-        
-        # A. Generate the main combination icon (no event)
-        output_name = f"ic_launcher_{persona}_{season}_{mood}.xml"
-        output_path = OUT_DIR / output_name
-        combine_layers(*base_layers, output_svg=output_path)
-        all_icons.append(output_path)
+    # 2. Generate for every combination of persona, season, mood. Each
+    # combination is independent, so fan out across a thread pool
+    combos = list(itertools.product(PERSONAS, SEASONS, MOODS))
+    with ThreadPoolExecutor() as executor:
+        for emitted in executor.map(lambda combo: emit_combo(*combo), combos):
+            all_icons.extend(emitted)
 
-        # B. Generate icons for each event
-        for event_name, (_, overlay_file) in EVENTS.items():
-            event_overlay = BASE_DIR / "events" / overlay_file
-            event_layers = base_layers + [event_overlay]
-            event_output_name = f"ic_launcher_{persona}_{season}_{mood}_{event_name}.xml"
-            event_output_path = OUT_DIR / event_output_name
-            combine_layers(*event_layers, output_svg=event_output_path)
-            all_icons.append(event_output_path)
-
-        # C. Generate transition frames for this combination
-        transition_base_name = f"ic_launcher_{persona}_{season}_{mood}_pop"
-        # Pass layer info to the transition generator
-        make_transition_frames(base_layers, base_layers, "pop", OUT_DIR / transition_base_name)
-        all_icons.append(OUT_DIR / f"{transition_base_name}_frame1.xml")
-        all_icons.append(OUT_DIR / f"{transition_base_name}_frame2.xml")
+    # Prune outputs from previous runs that this run no longer produces,
+    # then persist the manifest for the next incremental build
+    for name in set(_manifest_old) - set(_manifest_new):
+        stale = OUT_DIR / name
+        if stale.exists():
+            stale.unlink()
+    MANIFEST_PATH.write_text(json.dumps(_manifest_new, indent=2, sort_keys=True))
+    _manifest_new = None
 
     print(f"Generated {len(all_icons)} icons/frames in {OUT_DIR}")
 
@@ -126,6 +235,18 @@ import shutil
 # ... existing constants ...
 DRAWABLE_DIR = Path(__file__).parent.parent / "src/main/res/drawable"
 
+# The placeholder drawable is identical for every SVG, so encode it once
+_DRAWABLE_STUB = (
+    '<vector xmlns:android="http://schemas.android.com/apk/res/android"\n'
+    '    android:width="108dp"\n'
+    '    android:height="108dp"\n'
+    '    android:viewportWidth="108"\n'
+    '    android:viewportHeight="108">\n'
+    '    <!-- Placeholder for SVG content -->\n'
+    '</vector>\n'
+).encode()
+
+
 def convert_svg_to_xml_drawable(svg_path, xml_path):
     """
     Creates a placeholder VectorDrawable XML file from an SVG asset.
@@ -134,27 +255,32 @@ def convert_svg_to_xml_drawable(svg_path, xml_path):
     original SVG, a pattern that some build systems can handle.
     """
     # A real implementation would parse the SVG and convert path data.
-    # For now, we just create a valid, empty vector drawable XML.
-    with open(xml_path, "w") as f:
-        f.write('<vector xmlns:android="http://schemas.android.com/apk/res/android"\n')
-        f.write('    android:width="108dp"\n')
-        f.write('    android:height="108dp"\n')
-        f.write('    android:viewportWidth="108"\n')
-        f.write('    android:viewportHeight="108">\n')
-        f.write('    <!-- Placeholder for SVG content -->\n')
-        f.write('</vector>\n')
+    # For now, one write of the shared stub bytes is all that's needed.
+    Path(xml_path).write_bytes(_DRAWABLE_STUB)
 
 
 def clean_generated_files():
-    """Removes previously generated icons and drawables."""
+    """Removes stray generated files without nuking unchanged ones.
+
+    Icons tracked by the manifest are left in place so the next
+    generate_all_icons run can skip rewriting them; only files the
+    manifest does not know about are removed. Drawables are dropped when
+    their source SVG no longer exists.
+    """
     print("🧹 Cleaning generated files...")
-    if OUT_DIR.exists():
-        shutil.rmtree(OUT_DIR)
-    if DRAWABLE_DIR.exists():
-        shutil.rmtree(DRAWABLE_DIR)
     OUT_DIR.mkdir(exist_ok=True, parents=True)
     DRAWABLE_DIR.mkdir(exist_ok=True, parents=True)
 
+    manifest = _load_manifest()
+    for path in OUT_DIR.iterdir():
+        if path.is_file() and path != MANIFEST_PATH and path.name not in manifest:
+            path.unlink()
+
+    svg_names = {asset.stem for asset in BASE_DIR.glob("**/*.svg")}
+    for path in DRAWABLE_DIR.glob("*.xml"):
+        if path.stem not in svg_names:
+            path.unlink()
+
 
 def setup_drawables():
     """
@@ -163,11 +289,19 @@ def setup_drawables():
     DRAWABLE_DIR.mkdir(exist_ok=True, parents=True)
     asset_files = list(BASE_DIR.glob("**/*.svg"))
     # print(f"Found {len(asset_files)} SVG assets to convert.")
-    for asset in asset_files:
+
+    def convert_one(asset):
         xml_name = asset.with_suffix(".xml").name
         xml_path = DRAWABLE_DIR / xml_name
+        # Incremental: only reconvert when the SVG is newer than the stub
+        if xml_path.exists() and xml_path.stat().st_mtime >= asset.stat().st_mtime:
+            return
         convert_svg_to_xml_drawable(asset, xml_path)
 
+    # Each conversion is an independent stat + write, so overlap the I/O
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(convert_one, asset_files))
+
 # ... existing functions ...
 
 if __name__ == "__main__":
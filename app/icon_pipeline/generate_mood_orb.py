@@ -1,8 +1,42 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import numpy as np
 from PIL import Image, ImageDraw
-import math
-import random
+
+try:
+    # libvips keeps a fully multithreaded resize/encode pipeline outside
+    # the GIL; fall back to Pillow when it is not installed
+    import pyvips
+except ImportError:
+    pyvips = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = prange = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _gradient_kernel(arr, center, radius, sr, sg, sb, er, eg, eb):
+        # Distance, blend and alpha fused into one parallel pass over a
+        # preallocated buffer instead of several full-frame temporaries
+        size = arr.shape[0]
+        for y in prange(size):
+            dy = y - center
+            for x in range(size):
+                dx = x - center
+                dist = (dx * dx + dy * dy) ** 0.5
+                ratio = dist / radius
+                if ratio > 1.0:
+                    ratio = 1.0
+                inv = 1.0 - ratio
+                arr[y, x, 0] = np.uint8(sr * ratio + er * inv)
+                arr[y, x, 1] = np.uint8(sg * ratio + eg * inv)
+                arr[y, x, 2] = np.uint8(sb * ratio + eb * inv)
+                arr[y, x, 3] = np.uint8(255) if dist <= radius else np.uint8(0)
+else:
+    _gradient_kernel = None
 
 def hex_to_rgb(hex_str):
     hex_str = hex_str.lstrip('#')
@@ -32,36 +66,54 @@ DENSITIES = {
 # Procedural orb generator
 
 def create_glowing_mist_orb(start_hex, end_hex, size=512, glow_strength=0.6, mist_density=0.35):
-    img = Image.new("RGBA", (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
     center = size // 2
     radius = int(size / 2.2)
-    # Radial gradient core
-    for r in range(radius, 0, -1):
-        ratio = r / radius
-        color = tuple(
-            int(hex_to_rgb(start_hex)[i] * ratio + hex_to_rgb(end_hex)[i] * (1 - ratio)) for i in range(3)
-        ) + (255,)
-        draw.ellipse([
-            center - r, center - r, center + r, center + r
-        ], fill=color)
-    # Glow effect
-    for i in range(4):
-        alpha = int(255 * glow_strength / (i + 1))
-        glow_color = hex_to_rgb(start_hex) + (alpha,)
-        r = radius + i * 8
-        draw.ellipse([
-            center - r, center - r, center + r, center + r
-        ], outline=glow_color, width=6 + i * 4)
-    # Mist overlay
+    # Parse the endpoint colors once instead of inside every loop iteration
+    sr, sg, sb = hex_to_rgb(start_hex)
+    er, eg, eb = hex_to_rgb(end_hex)
+    # Radial gradient core as one vectorized pass: each pixel is written
+    # exactly once instead of being overdrawn by ~radius nested ellipses.
+    # With numba installed the whole thing is a single fused JIT kernel
+    if _gradient_kernel is not None:
+        arr = np.empty((size, size, 4), dtype=np.uint8)
+        _gradient_kernel(arr, center, radius, sr, sg, sb, er, eg, eb)
+    else:
+        yy, xx = np.ogrid[:size, :size]
+        dist = np.hypot(xx - center, yy - center)
+        ratio = np.clip(dist / radius, 0.0, 1.0)[..., None].astype(np.float32)
+        start = np.array([sr, sg, sb], dtype=np.float32)
+        end = np.array([er, eg, eb], dtype=np.float32)
+        rgb = (start * ratio + end * (1.0 - ratio)).astype(np.uint8)
+        alpha = ((dist <= radius) * 255).astype(np.uint8)[..., None]
+        arr = np.concatenate([rgb, alpha], axis=-1)
+    # Mist overlay: sample every particle at once and splat the 4x4 white
+    # blocks with 16 fancy-indexed writes instead of one draw call each
     mist_particles = int(size * mist_density)
-    for _ in range(mist_particles):
-        px = int(math.floor(random.random() * size))
-        py = int(math.floor(random.random() * size))
-        alpha = int(255 * random.random() * 0.15)
-        draw.ellipse([
-            px, py, px + 4, py + 4
-        ], fill=(255, 255, 255, alpha))
+    if mist_particles:
+        xs = np.random.randint(0, size - 4, mist_particles)
+        ys = np.random.randint(0, size - 4, mist_particles)
+        alphas = (np.random.random(mist_particles) * 255 * 0.15).astype(np.uint8)
+        # Source-over blend with the sampled alpha keeps each particle a
+        # faint 0-15% white wash instead of an opaque white square
+        weight = (alphas.astype(np.float32) / 255.0)[:, None]
+        for dy in range(4):
+            for dx in range(4):
+                rgb = arr[ys + dy, xs + dx, :3].astype(np.float32)
+                arr[ys + dy, xs + dx, :3] = (
+                    rgb * (1.0 - weight) + 255.0 * weight
+                ).astype(np.uint8)
+                arr[ys + dy, xs + dx, 3] = np.maximum(arr[ys + dy, xs + dx, 3], alphas)
+    img = Image.fromarray(arr, "RGBA")
+    draw = ImageDraw.Draw(img)
+    # Glow effect: compute all ring geometry up front so the loop body is
+    # nothing but draw calls
+    glow_specs = [
+        (center - r, center - r, center + r, center + r,
+         int(255 * glow_strength / (i + 1)), 6 + i * 4)
+        for i, r in ((i, radius + i * 8) for i in range(4))
+    ]
+    for x0, y0, x1, y1, alpha, width in glow_specs:
+        draw.ellipse([x0, y0, x1, y1], outline=(sr, sg, sb, alpha), width=width)
     return img
 
 def main():
@@ -73,13 +125,43 @@ def main():
         app_res_dir = Path(__file__).parent.parent.parent / "app" / "src" / "main" / "res"
         start_hex, end_hex = MOOD_GRADIENTS.get(mood, MOOD_GRADIENTS["calm"])
         orb = create_glowing_mist_orb(start_hex, end_hex)
-        for dpi, size in DENSITIES.items():
+        if pyvips is not None:
+            orb_arr = np.asarray(orb)
+            vips_orb = pyvips.Image.new_from_memory(
+                orb_arr.tobytes(), orb.width, orb.height, 4, "uchar"
+            )
+        def emit_vips(dpi, size):
             out_dir = app_res_dir / dpi
             out_dir.mkdir(parents=True, exist_ok=True)
-            orb_resized = orb.resize((size, size), Image.LANCZOS)
             out_path = out_dir / "ic_launcher.png"
             print(f"Saving icon to: {out_path}")
-            orb_resized.save(out_path)
+            vips_orb.thumbnail_image(size).write_to_file(str(out_path))
+
+        if pyvips is not None:
+            with ThreadPoolExecutor(max_workers=len(DENSITIES)) as executor:
+                list(executor.map(lambda kv: emit_vips(*kv), DENSITIES.items()))
+            return
+
+        # Mipmap chain: 512→192→144→96→72→48. Each Lanczos pass reads a
+        # nearby-size source instead of the full 512px master, so total
+        # pixel work is dominated by the largest output. The chain is
+        # inherently sequential; the PNG encodes still overlap in threads
+        sizes_desc = sorted(DENSITIES.items(), key=lambda kv: -kv[1])
+        prev = orb
+        with ThreadPoolExecutor(max_workers=len(DENSITIES)) as executor:
+            saves = []
+            for dpi, size in sizes_desc:
+                out_dir = app_res_dir / dpi
+                out_dir.mkdir(parents=True, exist_ok=True)
+                out_path = out_dir / "ic_launcher.png"
+                print(f"Saving icon to: {out_path}")
+                prev = prev.resize((size, size), Image.LANCZOS)
+                # Low compression: these launcher assets are small, and
+                # Pillow releases the GIL around the encode C kernels
+                saves.append(executor.submit(
+                    prev.save, out_path, optimize=False, compress_level=1))
+            for save in saves:
+                save.result()
     except Exception as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(2)
@@ -1,4 +1,6 @@
+import functools
 import os
+import numpy as np
 from PIL import Image # Make sure Pillow is installed in your Python env (pip install Pillow)
 import sys
 
@@ -8,6 +10,39 @@ import sys
 ASSET_BASE_PATH = "app/icon_pipeline/assets" # Example: project_root/app/icon_pipeline/assets
 OUTPUT_PATH_BASE = "app/icon_pipeline/output" # Example: project_root/app/icon_pipeline/output
 
+@functools.lru_cache(maxsize=64)
+def _load_asset(path, size=None):
+    """Opens, converts and (optionally) resizes an asset once per key.
+
+    The same mood/season/event overlays recur across many icon combos,
+    so the decoded RGBA image is cached per (path, size). Callers must
+    not mutate the returned image in place.
+    """
+    image = Image.open(path).convert("RGBA")
+    if size is not None and image.size != size:
+        print(f"⚠️ Warning: Overlay {path} size {image.size} differs from base size {size}. Resizing overlay.")
+        image = image.resize(size, Image.Resampling.LANCZOS)
+    return image
+
+def _composite_layers(base, overlays):
+    """Flattens the base and overlays in one Porter-Duff reduction.
+
+    The whole stack is accumulated premultiplied in float32 and
+    converted back to an image once, instead of allocating a fresh
+    full-size RGBA result per alpha_composite call.
+    """
+    acc = np.asarray(base, dtype=np.float32) / 255.0
+    acc_a = acc[..., 3:]
+    acc_rgb = acc[..., :3] * acc_a
+    for overlay in overlays:
+        layer = np.asarray(overlay, dtype=np.float32) / 255.0
+        a = layer[..., 3:]
+        acc_rgb = layer[..., :3] * a + acc_rgb * (1.0 - a)
+        acc_a = a + acc_a * (1.0 - a)
+    rgb = acc_rgb / np.maximum(acc_a, 1e-6)
+    out = np.concatenate([rgb, acc_a], axis=-1)
+    return Image.fromarray((out * 255.0 + 0.5).astype(np.uint8), "RGBA")
+
 def generate(persona, mood, season, event=None):
     # Ensure output directory exists
     if not os.path.exists(OUTPUT_PATH_BASE):
@@ -20,7 +55,7 @@ def generate(persona, mood, season, event=None):
         print(f"❌ Error: Base persona icon not found at {base_image_path}")
         return
 
-    final_image = Image.open(base_image_path).convert("RGBA")
+    base_image = _load_asset(base_image_path)
 
     overlays_paths = [
         os.path.join(ASSET_BASE_PATH, "mood", f"{mood}.png"),
@@ -29,17 +64,16 @@ def generate(persona, mood, season, event=None):
     if event:
         overlays_paths.append(os.path.join(ASSET_BASE_PATH, "events", f"{event}.png"))
 
+    overlays = []
     for overlay_path in overlays_paths:
         if os.path.exists(overlay_path):
-            overlay_image = Image.open(overlay_path).convert("RGBA")
-            # Ensure overlay is the same size as the base, or handle resizing
-            if overlay_image.size != final_image.size:
-                print(f"⚠️ Warning: Overlay {overlay_path} size {overlay_image.size} differs from base size {final_image.size}. Resizing overlay.")
-                overlay_image = overlay_image.resize(final_image.size, Image.Resampling.LANCZOS)
-            final_image = Image.alpha_composite(final_image, overlay_image)
+            # Cached decode; resized to the base size inside the loader
+            overlays.append(_load_asset(overlay_path, base_image.size))
         else:
             print(f"⚠️ Warning: Overlay not found at {overlay_path}, skipping.")
 
+    final_image = _composite_layers(base_image, overlays) if overlays else base_image
+
     output_filename = f"{persona}_{mood}_{season}{'_' + event if event else ''}.png"
     full_output_path = os.path.join(OUTPUT_PATH_BASE, output_filename)
 